@@ -1,31 +1,34 @@
+import numpy as np
+
+
 def analisar_resultados(modelo_eclat):
     print("="*80)
     print("ANÁLISE DE RESULTADOS")
     print("="*80)
 
-    grupos = {}
-    # Agora cada itemset tem suporte como float (ex: 0.15), não contagem
-    for itemset, suporte in modelo_eclat.itemsets_frequentes.items():
-        k = len(itemset)
-        grupos.setdefault(k, []).append((itemset, suporte))
+    itemsets = modelo_eclat.itemsets_frequentes
+    tamanhos = itemsets.tamanhos
+    suportes = itemsets.suporte
 
     print("\nTOP ITEMSETS POR TAMANHO:\n")
-    for k in sorted(grupos.keys()):
+    for k in np.unique(tamanhos):
         print(f"--- Itemsets de tamanho {k} ---")
-        # Ordena pelos mais frequentes
-        top = sorted(grupos[k], key=lambda x: x[1], reverse=True)[:15]
-        for iset, sup in top:
-            # agora já é proporção, então não divide por total_transacoes
+        # Ordena pelos mais frequentes dentro do tamanho k
+        linhas = np.flatnonzero(tamanhos == k)
+        top = linhas[np.argsort(-suportes[linhas], kind="stable")[:15]]
+        for linha in top:
+            sup = suportes[linha]
             cont = sup * modelo_eclat.total_transacoes  # só pra mostrar também o número estimado de transações
-            print(f"  • {' + '.join(sorted(iset)):35s} | {sup:6.2%} ({cont:6.1f})")
+            print(f"  • {' + '.join(itemsets.itemset(linha)):35s} | {sup:6.2%} ({cont:6.1f})")
         print()
 
-    if modelo_eclat.regras:
+    regras = modelo_eclat.regras
+    if len(regras):
         print("\nTOP REGRAS DE ASSOCIAÇÃO:\n")
-        for i, r in enumerate(modelo_eclat.regras[:10], 1):
-            ant = " + ".join(r["antecedente"])
-            cons = " + ".join(r["consequente"])
-            print(f"{i:2d}. [{ant}] → [{cons}] | sup={r['suporte']:.2%} conf={r['confianca']:.1%} lift={r['lift']:.2f}")
+        for i in range(min(10, len(regras))):
+            ant = " + ".join(regras.antecedente(i))
+            cons = " + ".join(regras.consequente(i))
+            print(f"{i + 1:2d}. [{ant}] → [{cons}] | sup={regras.suporte[i]:.2%} conf={regras.confianca[i]:.1%} lift={regras.lift[i]:.2f}")
     else:
         print("\nNenhuma regra gerada com os parâmetros atuais")
 
@@ -1,7 +1,10 @@
 import math
+import random
 from collections import defaultdict
-from itertools import combinations
+from itertools import chain, combinations
+import numpy as np
 import pandas as pd
+from resultados import ItemsetsColunares, RegrasColunares
 
 class MineradorECLAT:
     """
@@ -14,21 +17,28 @@ class MineradorECLAT:
         self.min_lift = min_lift
         self.transacoes = []
         self.total_transacoes = 0
-        self.itemsets_frequentes = {}   # {frozenset: contagem}
-        self.regras = []
+        self.itens = np.array([], dtype=object)   # vocabulário: o id de cada item é sua posição
+        self._id_item = {}
+        self.itemsets_frequentes = ItemsetsColunares.vazio()
+        self.itemsets_possivelmente_perdidos = ItemsetsColunares.vazio()   # apenas no modo aproximado
+        self.regras = RegrasColunares.vazio()
+
+    def _construir_vocabulario(self, transacoes):
+        self.itens = np.array(sorted({item for transacao in transacoes for item in transacao}), dtype=object)
+        self._id_item = {item: id_item for id_item, item in enumerate(self.itens)} #mapeia o nome do item para seu id
 
     def _construir_tidlist(self, transacoes):
         tidlist = defaultdict(set) #Cria dicionário onde cada item adicionado(chave) é acompanhado de um conjunto vazio(valor) -- set porque evita duplicatas
         for id_transacao, lista_itens in enumerate(transacoes): #percorre todas as transações passadas e dá um id a elas(através do enumerate)
             for produto in lista_itens: #percorre cada produto da lista de produtos
-                tidlist[produto].add(id_transacao) #cria o produto como item no dicionário (se ele já não existir) e adciona a transação presente. 
+                tidlist[self._id_item[produto]].add(id_transacao) #cria o produto como item no dicionário (se ele já não existir) e adciona a transação presente. 
         return {item: frozenset(tids) for item, tids in tidlist.items()} #transforma cada conjunto de produtos (conjunto de traasações - valor dos items do dict) em um frozenset(conjunto que não pode ter alterado)  
-        #Retorna um TID List (Dicionario com item e conjunto de tranasações)
+        #Retorna um TID List (Dicionario com id do item e conjunto de tranasações)
 
-    def _eclat(self, tidlist, min_count): 
+    def _eclat(self, tidlist, min_count, max_tamanho: int = None): 
         
-        itens_frequentes = [(frozenset([item]), transacoes) for item, transacoes in tidlist.items() if len(transacoes) >= min_count] #Adicona cada 
-        #item no formato frozen e sua respectiva lista de tranasações(TID) 
+        itens_frequentes = [(item, transacoes) for item, transacoes in tidlist.items() if len(transacoes) >= min_count] #Adicona cada 
+        #id de item e sua respectiva lista de tranasações(TID) 
         #na lista_frequentes caso possuam a quantidade de transações estipulada. 
         itens_frequentes.sort(key=lambda x: len(x[1])) #Ordena a lista de frequentes do menos para mais frequente
         
@@ -39,12 +49,15 @@ class MineradorECLAT:
             itens_restantes_ordenados = sorted(itens_restantes.items(), key= lambda lista_itens: len(lista_itens[1])) #Ordena os itens restantes, inicialmente, todos os itens. 
 
             for index, (item_atual, transacoes_atuais) in enumerate(itens_restantes_ordenados): #passa por todos os itens e suas transações em itens_restantes_ordenados
-                nova_combinacao = itens_prefixo | item_atual #une o prefixo(inicialmente vazio) e o item atual
-                suporte  = len(transacoes_atuais)/self.total_transacoes #calcula suporte do item atual
+                nova_combinacao = itens_prefixo + (item_atual,) #une o prefixo(inicialmente vazio) e o item atual
+                contagem = len(transacoes_atuais) #conta as transações do item atual
 
-                if suporte >= self.min_suporte: #verifica se suporte atende o mínimo suporte definido
-                    combinacoes_frequentes[nova_combinacao] = suporte #adiciona a combinação nova e seu suporte no set de combinações frequentes
+                if contagem >= min_count: #verifica se a contagem atende o mínimo definido
+                    combinacoes_frequentes[tuple(sorted(nova_combinacao))] = contagem #adiciona a combinação nova (ids ordenados) e sua contagem no dict de combinações frequentes
                 
+                if max_tamanho is not None and len(nova_combinacao) >= max_tamanho: #chegou ao tamanho máximo: não combina mais (nem calcula intersecções)
+                    continue
+
                 novos_itens_restantes = {} #cria dict de itens restantes
                 for proximo_item, proxima_transacao in itens_restantes_ordenados[index + 1:]: #passa por todos os itens restantes depois do item atual que já analisamos
                     interceccao = transacoes_atuais & proxima_transacao #verifica se existe intersecção entre o item que analisamos e o item que estamos analisando agora
@@ -54,8 +67,8 @@ class MineradorECLAT:
                 if novos_itens_restantes: #se o dict de novos_itens_restantes não estiver vazio, chama a propria função, agora com o prefixo do item que analisamos primeiro, os novos itens restantes(que possuem alguma intersecao com os intensd de prefixo)
                     gerar_combinacoes_frequentes(nova_combinacao, novos_itens_restantes, combinacoes_frequentes)
 
-        gerar_combinacoes_frequentes(frozenset(), dict(itens_frequentes), combinacoes_frequentes) #chama a função combinar para passar por todos os itens frequentes
-        return combinacoes_frequentes #retorna todas as combinações encontradas
+        gerar_combinacoes_frequentes((), dict(itens_frequentes), combinacoes_frequentes) #chama a função combinar para passar por todos os itens frequentes
+        return combinacoes_frequentes #retorna todas as combinações encontradas {tupla de ids: contagem}
 
     def minerar_itemsets(self, transacoes, max_tamanho: int = None): #trocar nome
         self.transacoes = [sorted(set(transacao)) for transacao in transacoes if transacao] #Remove transacoes vazias, duplicatas e ordena cada transação.
@@ -63,64 +76,192 @@ class MineradorECLAT:
         min_count = max(1, math.ceil(self.min_suporte * self.total_transacoes)) #faz o contador mínimo, sendo 1 ou o valor que der a conta do suporte minimo. 
 
         print(f"Minerando itemsets (N={self.total_transacoes}, suporte mínimo={self.min_suporte:.2%} => {min_count})")
+        self._construir_vocabulario(self.transacoes)
         tidlist = self._construir_tidlist(self.transacoes) #chama a função de construir o TIDLIST
-        combinacoes_encontradas = self._eclat(tidlist, min_count) #chama o eclat
-
-        if max_tamanho is not None: #filtra para tamanho máximo de conjuntos de itens (se houver)
-            combinacoes_encontradas = {conjunto_itens: transacoes_itens for conjunto_itens, transacoes_itens in combinacoes_encontradas.items() if len(conjunto_itens) <= max_tamanho}
+        combinacoes_encontradas = self._eclat(tidlist, min_count, max_tamanho) #chama o eclat (a recursão para em max_tamanho itens, se houver)
 
-        self.itemsets_frequentes = combinacoes_encontradas #atribui os itens frequentes as combinações encontradas no eclat
+        self.itemsets_possivelmente_perdidos = ItemsetsColunares.vazio(self.itens, self.total_transacoes)
+        self.itemsets_frequentes = ItemsetsColunares.de_contagens(self.itens, combinacoes_encontradas, self.total_transacoes) #guarda as combinações encontradas no eclat em colunas
         print(f"Itemsets frequentes: {len(self.itemsets_frequentes)}") 
         return self #retorna o proprio objeto
 
-    def gerar_regras(self):
-        regras = [] #Cria lista vaia de regras
+    @staticmethod
+    def _fronteira_negativa(itemsets, itens, max_tamanho=None):
+        """
+        Itemsets que não são frequentes mas cujos subconjuntos imediatos todos são (Toivonen).
+        """
+        fronteira = {(item,) for item in itens if (item,) not in itemsets} #itens isolados que não passaram
+        por_tamanho = defaultdict(list)
+        for itemset in itemsets:
+            por_tamanho[len(itemset)].append(itemset)
+
+        for k in sorted(por_tamanho):
+            if max_tamanho is not None and k + 1 > max_tamanho:
+                break
+            anteriores = sorted(por_tamanho[k])
+            for i, a in enumerate(anteriores): #junção estilo Apriori: une itemsets que compartilham os k-1 primeiros itens
+                for b in anteriores[i + 1:]:
+                    if a[:-1] != b[:-1]:
+                        break
+                    candidato = a + b[-1:]
+                    if candidato in itemsets:
+                        continue
+                    if all(candidato[:j] + candidato[j + 1:] in itemsets for j in range(len(candidato))): #todos os subconjuntos imediatos são frequentes
+                        fronteira.add(candidato)
+        return fronteira
+
+    @staticmethod
+    def _log_total_itemsets(n_itens: int, max_tamanho: int = None) -> float:
+        """
+        ln(M), com M o número de itemsets possíveis de até `max_tamanho` itens, calculado em escala log.
+        """
+        if max_tamanho is None or max_tamanho >= n_itens: #todos os subconjuntos não vazios: M = 2^n - 1 <= 2^n
+            return n_itens * math.log(2)
+        log_comb = [math.lgamma(n_itens + 1) - math.lgamma(k + 1) - math.lgamma(n_itens - k + 1) for k in range(1, max_tamanho + 1)]
+        maior = max(log_comb)
+        return maior + math.log(sum(math.exp(valor - maior) for valor in log_comb)) #log-sum-exp das combinações C(n, k)
+
+    def _contar_itemsets(self, transacoes, itemsets):
+        """
+        Conta os itemsets (tuplas de ids) em uma única passagem pelas transações. Itens isolados saem de um
+        bincount; bitmaps (um por item) só são montados para os itens que aparecem em itemsets de 2 ou mais itens.
+        """
+        tamanhos = np.fromiter(map(len, transacoes), dtype=np.int64, count=len(transacoes))
+        ids = np.fromiter(map(self._id_item.__getitem__, chain.from_iterable(transacoes)), dtype=np.int64, count=tamanhos.sum())
+        contagem_item = np.bincount(ids, minlength=len(self.itens))
+        contagens = {itemset: int(contagem_item[itemset[0]]) for itemset in itemsets if len(itemset) == 1}
+
+        compostos = [itemset for itemset in itemsets if len(itemset) >= 2]
+        if not compostos:
+            return contagens
+        usados = np.unique(np.fromiter(chain.from_iterable(compostos), dtype=np.int64))
+        linha_item = np.full(len(self.itens), -1, dtype=np.int64) #id do item -> linha do bitmap (-1: sem bitmap)
+        linha_item[usados] = np.arange(len(usados))
+        linhas = linha_item[ids]
+        presentes = linhas >= 0
+        tids = np.repeat(np.arange(len(transacoes), dtype=np.uint64), tamanhos)[presentes]
+        bitmaps = np.zeros((len(usados), (len(transacoes) + 63) // 64), dtype=np.uint64) #bit t da linha i: item usados[i] está na transação t
+        np.bitwise_or.at(bitmaps, (linhas[presentes], (tids >> np.uint64(6)).astype(np.int64)), np.left_shift(np.uint64(1), tids & np.uint64(63)))
+
+        for itemset in compostos:
+            acumulado = bitmaps[linha_item[itemset[0]]].copy()
+            for item in itemset[1:]:
+                acumulado &= bitmaps[linha_item[item]]
+            contagens[itemset] = int(np.bitwise_count(acumulado).sum())
+        return contagens
 
-        for itemset, suporte_itemset in self.itemsets_frequentes.items(): #passa por todos os itens e seus respsctivos suportes em itens frequentes encontrados
-            if len(itemset) < 2: #só continua se houver combinação (mais de um item)
-                continue
+    def minerar_itemsets_aproximado(self, transacoes, epsilon: float = 0.01, delta: float = 0.05,
+                                    max_tamanho: int = None, verificar: bool = True, semente: int = None):
+        """
+        Minera uma amostra de n >= ln(2*M/delta) / (2*epsilon^2) transações (M: itemsets possíveis de até `max_tamanho` itens).
+        Em `itemsets_possivelmente_perdidos`: com `verificar`, itemsets da fronteira negativa frequentes na base completa;
+        sem, candidatos com suporte na amostra entre min_suporte - epsilon e min_suporte.
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon e delta devem estar entre 0 e 1")
+        if epsilon >= self.min_suporte: #suporte reduzido <= 0: a amostra listaria todos os subconjuntos de cada transação
+            raise ValueError("epsilon deve ser menor que o suporte mínimo")
 
-            itens = list(itemset) #(transforma o itemset em lista)
+        transacoes_limpas = [sorted(set(transacao)) for transacao in transacoes if transacao]
+        self._construir_vocabulario(transacoes_limpas) #itens ausentes da amostra também entram no vocabulário e na fronteira
+        log_total_itemsets = self._log_total_itemsets(len(self.itens), max_tamanho) #ln(M)
+        tamanho_amostra = math.ceil((math.log(2 / delta) + log_total_itemsets) / (2 * epsilon ** 2)) #Chernoff-Hoeffding + limite da união
+        if tamanho_amostra >= len(transacoes_limpas): #amostra maior que a base: o modo exato é mais barato
+            print(f"Amostra necessária ({tamanho_amostra}) >= base ({len(transacoes_limpas)}); usando modo exato")
+            return self.minerar_itemsets(transacoes_limpas, max_tamanho=max_tamanho)
+
+        self.transacoes = transacoes_limpas
+        self.total_transacoes = len(self.transacoes)
+        amostra = random.Random(semente).sample(self.transacoes, tamanho_amostra)
+        suporte_reduzido = self.min_suporte - epsilon #suporte mínimo reduzido para a amostra
+        min_count_amostra = max(1, math.ceil(suporte_reduzido * tamanho_amostra))
+
+        print(f"Minerando itemsets na amostra (n={tamanho_amostra} de N={self.total_transacoes}, "
+              f"epsilon={epsilon:.2%}, delta={delta:.2%}, suporte reduzido={suporte_reduzido:.2%} => {min_count_amostra})")
+        tidlist_amostra = self._construir_tidlist(amostra)
+        candidatos = self._eclat(tidlist_amostra, min_count_amostra, max_tamanho)
+
+        if verificar: #segunda passagem: contagem exata de candidatos e fronteira na base completa
+            fronteira = self._fronteira_negativa(candidatos, range(len(self.itens)), max_tamanho)
+            contagens = self._contar_itemsets(self.transacoes, list(candidatos) + list(fronteira))
+            min_count = max(1, math.ceil(self.min_suporte * self.total_transacoes))
+            total_resultado = self.total_transacoes
+
+            combinacoes_encontradas = {itemset: contagens[itemset] for itemset in candidatos if contagens[itemset] >= min_count}
+            perdidos = {itemset: contagens[itemset] for itemset in fronteira if contagens[itemset] >= min_count} #frequente de verdade: ele e seus superconjuntos podem ter faltado na amostra
+            combinacoes_encontradas.update(perdidos)
+        else: #sem verificação: a contagem na amostra é a estimativa
+            total_resultado = tamanho_amostra
+            min_count = self.min_suporte * tamanho_amostra
+            combinacoes_encontradas = {itemset: contagem for itemset, contagem in candidatos.items() if contagem >= min_count}
+            perdidos = {itemset: contagem for itemset, contagem in candidatos.items() if contagem < min_count} #abaixo do mínimo na amostra: incertos, não frequentes
+
+        self.itemsets_frequentes = ItemsetsColunares.de_contagens(self.itens, combinacoes_encontradas, total_resultado)
+        self.itemsets_possivelmente_perdidos = ItemsetsColunares.de_contagens(self.itens, perdidos, total_resultado)
+        print(f"Itemsets frequentes (aproximado): {len(self.itemsets_frequentes)}")
+        print(f"Itemsets possivelmente perdidos: {len(self.itemsets_possivelmente_perdidos)}")
+        return self
+
+    def gerar_regras(self):
+        itemsets = self.itemsets_frequentes
+        ant_ids, ant_tamanhos, cons_ids, cons_tamanhos = [], [], [], [] #colunas das regras candidatas
+        contagens_regra, contagens_ant, contagens_cons = [], [], []
+        ids, offsets = itemsets.item_ids.tolist(), itemsets.offsets.tolist()
+        contagem_por_itemset = {tuple(ids[inicio:fim]): contagem for inicio, fim, contagem
+                                in zip(offsets[:-1], offsets[1:], itemsets.contagem.tolist())} #busca local, descartada ao fim do método
+
+        for linha in np.flatnonzero(itemsets.tamanhos >= 2): #só passa pelos itemsets com combinação (mais de um item)
+            itens = tuple(itemsets.ids(linha).tolist()) #ids ordenados do itemset
+            contagem_itemset = int(itemsets.contagem[linha])
             for idx in range(1, len(itens)): #itera sobre a quantidade de itens no itemset
                 for itens_antecedentes in combinations(itens, idx): #combina todos os itens atecedentes (que começa com um só graças ao idx) com os itens consequencia
-                    itens_antecedentes = frozenset(itens_antecedentes) #gera um frozenset com os itens antecedentes
-                    itens_consequencia = itemset - itens_antecedentes #gera os itens consequencia
+                    itens_consequencia = tuple(item for item in itens if item not in itens_antecedentes) #gera os itens consequencia (continuam ordenados)
 
-                    suporte_itens_antecedentes = self.itemsets_frequentes.get(itens_antecedentes, 0) #pega o suporte dos itens antecedentes
-                    suporte_itens_restantes = self.itemsets_frequentes.get(itens_consequencia, 0) #pega o suporte dos intens consequencia
-                    if suporte_itens_antecedentes == 0 or suporte_itens_restantes == 0: #verifica se esse suporte realmente existe
+                    contagem_antecedentes = contagem_por_itemset.get(itens_antecedentes, 0) #pega a contagem dos itens antecedentes
+                    contagem_consequencia = contagem_por_itemset.get(itens_consequencia, 0) #pega a contagem dos intens consequencia
+                    if contagem_antecedentes == 0 or contagem_consequencia == 0: #verifica se essa contagem realmente existe
                         continue
 
-                    confianca = suporte_itemset / suporte_itens_antecedentes #calcula a confiança (probabilidade de B ocorrer dado que A ocorreu.)
-                    lift = confianca / suporte_itens_restantes #calcula o lift (Mede o quanto a presença de A aumenta (ou não) a chance de B.)
+                    ant_ids.extend(itens_antecedentes)
+                    ant_tamanhos.append(len(itens_antecedentes))
+                    cons_ids.extend(itens_consequencia)
+                    cons_tamanhos.append(len(itens_consequencia))
+                    contagens_regra.append(contagem_itemset)
+                    contagens_ant.append(contagem_antecedentes)
+                    contagens_cons.append(contagem_consequencia)
 
-                    if confianca >= self.min_confianca and lift >= self.min_lift: #adiciona a regra a lista de regras se passar pela confiação e lift minimos
+        contagens_regra = np.asarray(contagens_regra, dtype=np.float64)
+        suporte = contagens_regra / max(itemsets.total_transacoes, 1)
+        confianca = contagens_regra / np.asarray(contagens_ant, dtype=np.float64) #calcula a confiança (probabilidade de B ocorrer dado que A ocorreu.)
+        lift = confianca / (np.asarray(contagens_cons, dtype=np.float64) / max(itemsets.total_transacoes, 1)) #calcula o lift (Mede o quanto a presença de A aumenta (ou não) a chance de B.)
 
-                        regras.append({
-                            "antecedente": tuple(sorted(itens_antecedentes)), #transforma em tupla porque conjuntos (set) não podem ser salvos diretamente em CSV ou DataFrame.
-                            "consequente": tuple(sorted(itens_consequencia)),
-                            "suporte": suporte_itemset,
-                            "confianca": confianca,
-                            "lift": lift
-                        })
-
-        regras.sort(key=lambda r: (-r["lift"], -r["confianca"], -r["suporte"])) #ordena as regras
-        self.regras = regras #atribui as regras
+        candidatas = RegrasColunares(
+            self.itens,
+            np.concatenate(([0], np.cumsum(ant_tamanhos, dtype=np.int64))), ant_ids,
+            np.concatenate(([0], np.cumsum(cons_tamanhos, dtype=np.int64))), cons_ids,
+            suporte, confianca, lift,
+        )
+        aprovadas = np.flatnonzero((confianca >= self.min_confianca) & (lift >= self.min_lift)) #mantém as regras que passam pela confiança e lift minimos
+        self.regras = candidatas.selecionar(aprovadas).ordenadas() #filtra e ordena as regras
         print(f"Regras geradas: {len(self.regras)}")
         return self 
 
     def regras_df(self) -> pd.DataFrame:
-        if not self.regras:
+        if not len(self.regras):
             return pd.DataFrame()
-        return pd.DataFrame(self.regras)
+        return self.regras.para_dataframe(rotulos=True)
 
     def recomendar(self, itens_carrinho, top_n=5):
-        carrinho = set(itens_carrinho)
-        rank = defaultdict(float)
-        for regra in self.regras:
-            antecedente = set(regra["antecedente"])
-            if antecedente.issubset(carrinho):
-                for consequente in regra["consequente"]:
-                    if consequente not in carrinho:
-                        rank[consequente] += regra["lift"] * regra["confianca"]
-        return sorted(rank.items(), key=lambda x: x[1], reverse=True)[:top_n]
+        regras = self.regras
+        if not len(regras):
+            return []
+        no_carrinho = np.isin(self.itens, list(itens_carrinho)) #máscara do vocabulário com os itens do carrinho
+        ant_tamanhos = np.diff(regras.ant_offsets)
+        dispara = np.add.reduceat(no_carrinho[regras.ant_ids], regras.ant_offsets[:-1]) == ant_tamanhos #antecedente contido no carrinho
+
+        cons_tamanhos = np.diff(regras.cons_offsets)
+        peso = np.repeat(np.where(dispara, regras.lift * regras.confianca, 0.0), cons_tamanhos)
+        rank = np.bincount(regras.cons_ids, weights=peso, minlength=len(self.itens)) #soma os pesos por item consequente
+        rank[no_carrinho] = 0.0
+        ids_recomendados = [i for i in np.argsort(-rank, kind="stable")[:top_n] if rank[i] > 0]
+        return [(self.itens[i], float(rank[i])) for i in ids_recomendados]
@@ -6,14 +6,11 @@ def visualizar_top_items(modelo_eclat, top_n=15):
     """
     Gráfico de barras horizontais com os itens mais frequentes
     """
-    items_individuais = {
-        list(itemset)[0]: suporte 
-        for itemset, suporte in modelo_eclat.itemsets_frequentes.items() 
-        if len(itemset) == 1
-    }
-    
-    items_sorted = sorted(items_individuais.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    items, suportes = zip(*items_sorted)
+    itemsets = modelo_eclat.itemsets_frequentes
+    linhas = np.flatnonzero(itemsets.tamanhos == 1)
+    linhas = linhas[np.argsort(-itemsets.suporte[linhas], kind='stable')[:top_n]]
+    items = [itemsets.itemset(linha)[0] for linha in linhas]
+    suportes = itemsets.suporte[linhas]
     
     fig, ax = plt.subplots(figsize=(10, 8))
     y_pos = np.arange(len(items))
@@ -40,16 +37,10 @@ def visualizar_itemsets_por_tamanho(modelo_eclat):
     """
     Gráfico de barras mostrando distribuição de itemsets por tamanho
     """
-    tamanhos = {}
-    for itemset in modelo_eclat.itemsets_frequentes.keys():
-        k = len(itemset)
-        tamanhos[k] = tamanhos.get(k, 0) + 1
+    sizes, counts = np.unique(modelo_eclat.itemsets_frequentes.tamanhos, return_counts=True)
     
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    sizes = sorted(tamanhos.keys())
-    counts = [tamanhos[s] for s in sizes]
-    
     colors = plt.cm.plasma(np.linspace(0.3, 0.9, len(sizes)))
     bars = ax.bar(sizes, counts, color=colors, edgecolor='black', linewidth=1.5)
     
@@ -74,17 +65,14 @@ def visualizar_top_pares(modelo_eclat, top_n=10):
     Gráfico de barras com os pares de produtos mais frequentes
     """
     # Filtra itemsets de tamanho 2
-    pares = {
-        itemset: suporte 
-        for itemset, suporte in modelo_eclat.itemsets_frequentes.items() 
-        if len(itemset) == 2
-    }
+    itemsets = modelo_eclat.itemsets_frequentes
+    linhas = np.flatnonzero(itemsets.tamanhos == 2)
     
     # Ordena e pega top N
-    pares_sorted = sorted(pares.items(), key=lambda x: x[1], reverse=True)[:top_n]
+    linhas = linhas[np.argsort(-itemsets.suporte[linhas], kind='stable')[:top_n]]
     
-    labels = [' + '.join(sorted(par)) for par, _ in pares_sorted]
-    suportes = [sup * 100 for _, sup in pares_sorted]
+    labels = [' + '.join(itemsets.itemset(linha)) for linha in linhas]
+    suportes = itemsets.suporte[linhas] * 100
     
     fig, ax = plt.subplots(figsize=(12, 8))
     y_pos = np.arange(len(labels))
@@ -113,17 +101,18 @@ def visualizar_regras_associacao(modelo_eclat, top_n=10):
     """
     Gráfico de dispersão: Confiança vs Lift das regras
     """
-    if not modelo_eclat.regras:
+    regras = modelo_eclat.regras
+    if not len(regras):
         print("Nenhuma regra disponível para visualização")
         return None
     
-    top_regras = modelo_eclat.regras[:top_n]
+    n_regras = min(top_n, len(regras))
     
-    confidencias = [r['confianca'] * 100 for r in top_regras]
-    lifts = [r['lift'] for r in top_regras]
-    suportes = [r['suporte'] * 100 for r in top_regras]
-    labels = [f"{' + '.join(r['antecedente'])} → {' + '.join(r['consequente'])}" 
-              for r in top_regras]
+    confidencias = regras.confianca[:n_regras] * 100
+    lifts = regras.lift[:n_regras]
+    suportes = regras.suporte[:n_regras] * 100
+    labels = [f"{' + '.join(regras.antecedente(i))} → {' + '.join(regras.consequente(i))}" 
+              for i in range(n_regras)]
     
     fig, ax = plt.subplots(figsize=(12, 8))
     
@@ -159,18 +148,19 @@ def visualizar_metricas_regras(modelo_eclat, top_n=10):
     """
     Gráfico de barras agrupadas: Suporte, Confiança e Lift das top regras
     """
-    if not modelo_eclat.regras:
+    regras = modelo_eclat.regras
+    if not len(regras):
         print("Nenhuma regra disponível para visualização")
         return None
     
-    top_regras = modelo_eclat.regras[:top_n]
+    n_regras = min(top_n, len(regras))
     
-    labels = [f"{' + '.join(r['antecedente'][:1])} → {' + '.join(r['consequente'][:1])}" 
-              for r in top_regras]
+    labels = [f"{' + '.join(regras.antecedente(i)[:1])} → {' + '.join(regras.consequente(i)[:1])}" 
+              for i in range(n_regras)]
     
-    suportes = [r['suporte'] * 100 for r in top_regras]
-    confidencias = [r['confianca'] * 100 for r in top_regras]
-    lifts = [r['lift'] * 10 for r in top_regras]  # Escala para visualização
+    suportes = regras.suporte[:n_regras] * 100
+    confidencias = regras.confianca[:n_regras] * 100
+    lifts = regras.lift[:n_regras] * 10  # Escala para visualização
     
     x = np.arange(len(labels))
     width = 0.25
@@ -200,29 +190,27 @@ def visualizar_heatmap_coocorrencia(modelo_eclat, top_items=10):
     """
     Heatmap de co-ocorrência dos top items
     """
-    items_individuais = {
-        list(itemset)[0]: suporte 
-        for itemset, suporte in modelo_eclat.itemsets_frequentes.items() 
-        if len(itemset) == 1
-    }
-    
-    top_items_list = sorted(items_individuais.items(), key=lambda x: x[1], reverse=True)[:top_items]
-    top_items_names = [item for item, _ in top_items_list]
+    itemsets = modelo_eclat.itemsets_frequentes
+    unitarios = np.flatnonzero(itemsets.tamanhos == 1)
+    unitarios = unitarios[np.argsort(-itemsets.suporte[unitarios], kind='stable')[:top_items]]
+    top_ids = itemsets.item_ids[itemsets.offsets[unitarios]]
+    top_items_names = list(itemsets.itens[top_ids])
     
     n = len(top_items_names)
     matrix = np.zeros((n, n))
     
-    for itemset, suporte in modelo_eclat.itemsets_frequentes.items():
-        if len(itemset) == 2:
-            items = list(itemset)
-            if items[0] in top_items_names and items[1] in top_items_names:
-                i = top_items_names.index(items[0])
-                j = top_items_names.index(items[1])
-                matrix[i][j] = suporte * 100
-                matrix[j][i] = suporte * 100
-    
-    for i, item in enumerate(top_items_names):
-        matrix[i][i] = items_individuais[item] * 100
+    # Posição de cada id de item na matriz (-1 para itens fora do top)
+    posicao = np.full(len(itemsets.itens), -1)
+    posicao[top_ids] = np.arange(n)
+    
+    pares = np.flatnonzero(itemsets.tamanhos == 2)
+    i = posicao[itemsets.item_ids[itemsets.offsets[pares]]]
+    j = posicao[itemsets.item_ids[itemsets.offsets[pares] + 1]]
+    dentro = (i >= 0) & (j >= 0)
+    matrix[i[dentro], j[dentro]] = itemsets.suporte[pares[dentro]] * 100
+    matrix[j[dentro], i[dentro]] = itemsets.suporte[pares[dentro]] * 100
+    
+    matrix[np.arange(n), np.arange(n)] = itemsets.suporte[unitarios] * 100
     
     fig, ax = plt.subplots(figsize=(12, 10))
     
@@ -1,9 +1,42 @@
-import pandas as pd
+import argparse
 from preprocessamento import PreprocessadorVestuario
 from eclat import MineradorECLAT
 from analise import analisar_resultados, exemplos_recomendacao
 
+
+def fracao(valor: str) -> float:
+    """Converte o argumento em float no intervalo aberto (0, 1)."""
+    try:
+        numero = float(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{valor!r} não é um número")
+    if not 0 < numero < 1:
+        raise argparse.ArgumentTypeError(f"{valor} não está entre 0 e 1")
+    return numero
+
+
+def ler_argumentos(min_suporte: float):
+    parser = argparse.ArgumentParser(description="Mineração de regras de associação (ECLAT) nas vendas de vestuário.")
+    parser.add_argument("--aproximado", action="store_true",
+                        help="modo exploratório: minera uma amostra; com probabilidade 1-delta, o suporte de todos os "
+                             "itemsets na amostra fica a no máximo epsilon do real (se a amostra necessária for maior "
+                             "que a base, o modo exato é usado)")
+    parser.add_argument("--epsilon", type=fracao, default=0.05,
+                        help="erro máximo de suporte, entre 0 e o suporte mínimo (padrão: 0.05)")
+    parser.add_argument("--delta", type=fracao, default=0.05,
+                        help="probabilidade de falha do limite, entre 0 e 1 (padrão: 0.05)")
+    parser.add_argument("--sem-verificacao", action="store_true",
+                        help="com --aproximado, pula a segunda passagem pela base completa: suportes e contagens "
+                             "são os da amostra")
+    args = parser.parse_args()
+    if args.aproximado and args.epsilon >= min_suporte:
+        parser.error(f"--epsilon deve ser menor que o suporte mínimo ({min_suporte})")
+    return args
+
+
 if __name__ == "__main__":
+    min_suporte = 0.06
+    args = ler_argumentos(min_suporte)
     caminho_csv = "vendas_dataset.csv"
 
     # 1) Pré-processamento (usar categorias para reduzir esparsidade)
@@ -13,20 +46,21 @@ if __name__ == "__main__":
     print(f"\nTransações após processamento: {len(transacoes)}")
 
     # 2) ECLAT
-    miner = MineradorECLAT(min_suporte=0.06, min_confianca=0.40, min_lift=1.10)
-    miner.minerar_itemsets(transacoes, max_tamanho=3).gerar_regras()
+    miner = MineradorECLAT(min_suporte=min_suporte, min_confianca=0.40, min_lift=1.10)
+    if args.aproximado:
+        miner.minerar_itemsets_aproximado(transacoes, epsilon=args.epsilon, delta=args.delta, max_tamanho=3,
+                                          verificar=not args.sem_verificacao).gerar_regras()
+    else:
+        miner.minerar_itemsets(transacoes, max_tamanho=3).gerar_regras()
 
     # 3) Análise e exemplos
     analisar_resultados(miner)
     exemplos_recomendacao(miner)
 
     # 4) Salvar saídas
-    fi_df = pd.DataFrame(
-        [{"itemset": tuple(sorted(k)), "count": v, "support": v/ miner.total_transacoes}
-         for k, v in miner.itemsets_frequentes.items()]
-    ).sort_values(["support","count"], ascending=[False, False]).reset_index(drop=True)
+    fi_df = miner.itemsets_frequentes.para_dataframe(rotulos=True).sort_values(
+        ["support", "count"], ascending=[False, False]).reset_index(drop=True)
     regras_df = miner.regras_df()
 
     fi_df.to_csv("itemsets_frequentes_eclat.csv", index=False, encoding="utf-8")
     regras_df.to_csv("regras_associacao_eclat.csv", index=False, encoding="utf-8")
-
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+
+def _reordenar(offsets, ids, ordem):
+    """
+    Reordena (e/ou filtra) uma coluna irregular offsets + ids segundo `ordem`, sem laço em Python.
+    """
+    tamanhos = np.diff(offsets)[ordem]
+    novos_offsets = np.zeros(len(ordem) + 1, dtype=np.int64)
+    np.cumsum(tamanhos, out=novos_offsets[1:])
+    inicio = np.repeat(offsets[:-1][ordem] - novos_offsets[:-1], tamanhos) #deslocamento de cada posição nova até a antiga
+    return novos_offsets, ids[inicio + np.arange(novos_offsets[-1])]
+
+
+def _rotulos(itens, offsets, ids, sep):
+    nomes = itens[ids].tolist()
+    return [sep.join(nomes[inicio:fim]) for inicio, fim in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _tuplas(itens, offsets, ids):
+    nomes = itens[ids].tolist()
+    return [tuple(nomes[inicio:fim]) for inicio, fim in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as erro:
+        raise ImportError("Exportação Arrow/Parquet requer o pacote pyarrow") from erro
+    return pa
+
+
+def _lista_arrow(itens, offsets, ids):
+    pa = _pyarrow()
+    valores = pa.DictionaryArray.from_arrays(pa.array(ids, pa.int32()), pa.array(itens.tolist(), pa.string()))
+    return pa.LargeListArray.from_arrays(pa.array(offsets, pa.int64()), valores)
+
+
+class ItemsetsColunares:
+    """
+    Itemsets frequentes em colunas: o itemset i são os ids item_ids[offsets[i]:offsets[i+1]] (ordenados),
+    traduzidos pelo vocabulário `itens`, e contagem[i] é o número de transações que o contêm.
+    """
+
+    def __init__(self, itens, offsets, item_ids, contagem, total_transacoes: int):
+        self.itens = np.asarray(itens, dtype=object)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.item_ids = np.asarray(item_ids, dtype=np.int32)
+        self.contagem = np.asarray(contagem, dtype=np.int64)
+        self.total_transacoes = total_transacoes
+
+    @classmethod
+    def de_contagens(cls, itens, contagens, total_transacoes: int):
+        """
+        Monta a partir de {tupla de ids ordenados: contagem}.
+        """
+        tamanhos = np.fromiter((len(ids) for ids in contagens), dtype=np.int64, count=len(contagens))
+        offsets = np.zeros(len(contagens) + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=offsets[1:])
+        item_ids = np.fromiter((i for ids in contagens for i in ids), dtype=np.int32, count=offsets[-1])
+        contagem = np.fromiter(contagens.values(), dtype=np.int64, count=len(contagens))
+        return cls(itens, offsets, item_ids, contagem, total_transacoes)
+
+    @classmethod
+    def vazio(cls, itens=(), total_transacoes: int = 0):
+        return cls(itens, [0], [], [], total_transacoes)
+
+    def __len__(self):
+        return len(self.contagem)
+
+    @property
+    def tamanhos(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def suporte(self) -> np.ndarray:
+        if not self.total_transacoes:
+            return np.zeros(len(self), dtype=np.float64)
+        return self.contagem / self.total_transacoes
+
+    def ids(self, i: int) -> np.ndarray:
+        return self.item_ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def itemset(self, i: int) -> tuple:
+        return tuple(self.itens[self.ids(i)])
+
+    def selecionar(self, ordem) -> "ItemsetsColunares":
+        offsets, item_ids = _reordenar(self.offsets, self.item_ids, np.asarray(ordem, dtype=np.int64))
+        return ItemsetsColunares(self.itens, offsets, item_ids, self.contagem[ordem], self.total_transacoes)
+
+    def rotulos(self, sep: str = " + ") -> list[str]:
+        return _rotulos(self.itens, self.offsets, self.item_ids, sep)
+
+    def para_dataframe(self, rotulos: bool = False) -> pd.DataFrame:
+        """
+        DataFrame sobre as colunas numéricas (sem cópia), com os nomes do CSV de itemsets (count, support);
+        `rotulos=True` acrescenta o itemset como tupla de itens.
+        """
+        colunas = {"count": self.contagem, "support": self.suporte}
+        if rotulos:
+            colunas = {"itemset": _tuplas(self.itens, self.offsets, self.item_ids), **colunas}
+        return pd.DataFrame(colunas, copy=False)
+
+    def itens_dataframe(self) -> pd.DataFrame:
+        """
+        Formato longo (uma linha por item de cada itemset), sem montar tuplas em Python.
+        """
+        return pd.DataFrame({
+            "itemset": np.repeat(np.arange(len(self)), self.tamanhos),
+            "item": pd.Categorical.from_codes(self.item_ids, self.itens),
+        }, copy=False)
+
+    def para_arrow(self):
+        pa = _pyarrow()
+        return pa.table({
+            "itemset": _lista_arrow(self.itens, self.offsets, self.item_ids),
+            "count": self.contagem,
+            "support": self.suporte,
+        })
+
+    def salvar_parquet(self, caminho: str):
+        tabela = self.para_arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(tabela, caminho)
+
+    def salvar(self, caminho: str):
+        np.savez(caminho, itens=self.itens.astype(str), offsets=self.offsets, item_ids=self.item_ids,
+                 contagem=self.contagem, total_transacoes=self.total_transacoes)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "ItemsetsColunares":
+        with np.load(caminho) as dados:
+            return cls(dados["itens"], dados["offsets"], dados["item_ids"], dados["contagem"],
+                       int(dados["total_transacoes"]))
+
+
+class RegrasColunares:
+    """
+    Regras de associação em colunas: antecedente e consequente como offsets + ids de itens
+    (mesmo vocabulário dos itemsets) e uma coluna por métrica.
+    """
+
+    def __init__(self, itens, ant_offsets, ant_ids, cons_offsets, cons_ids, suporte, confianca, lift):
+        self.itens = np.asarray(itens, dtype=object)
+        self.ant_offsets = np.asarray(ant_offsets, dtype=np.int64)
+        self.ant_ids = np.asarray(ant_ids, dtype=np.int32)
+        self.cons_offsets = np.asarray(cons_offsets, dtype=np.int64)
+        self.cons_ids = np.asarray(cons_ids, dtype=np.int32)
+        self.suporte = np.asarray(suporte, dtype=np.float64)
+        self.confianca = np.asarray(confianca, dtype=np.float64)
+        self.lift = np.asarray(lift, dtype=np.float64)
+
+    @classmethod
+    def vazio(cls, itens=()):
+        return cls(itens, [0], [], [0], [], [], [], [])
+
+    def __len__(self):
+        return len(self.lift)
+
+    def antecedente(self, i: int) -> tuple:
+        return tuple(self.itens[self.ant_ids[self.ant_offsets[i]:self.ant_offsets[i + 1]]])
+
+    def consequente(self, i: int) -> tuple:
+        return tuple(self.itens[self.cons_ids[self.cons_offsets[i]:self.cons_offsets[i + 1]]])
+
+    def selecionar(self, ordem) -> "RegrasColunares":
+        ordem = np.asarray(ordem, dtype=np.int64)
+        ant_offsets, ant_ids = _reordenar(self.ant_offsets, self.ant_ids, ordem)
+        cons_offsets, cons_ids = _reordenar(self.cons_offsets, self.cons_ids, ordem)
+        return RegrasColunares(self.itens, ant_offsets, ant_ids, cons_offsets, cons_ids,
+                               self.suporte[ordem], self.confianca[ordem], self.lift[ordem])
+
+    def ordenadas(self) -> "RegrasColunares":
+        """
+        Ordena por lift, confiança e suporte (decrescentes).
+        """
+        return self.selecionar(np.lexsort((-self.suporte, -self.confianca, -self.lift)))
+
+    def para_dataframe(self, rotulos: bool = False) -> pd.DataFrame:
+        """
+        DataFrame sobre as colunas de métricas (sem cópia); `rotulos=True` acrescenta antecedente/consequente como tuplas.
+        """
+        colunas = {"suporte": self.suporte, "confianca": self.confianca, "lift": self.lift}
+        if rotulos:
+            colunas = {
+                "antecedente": _tuplas(self.itens, self.ant_offsets, self.ant_ids),
+                "consequente": _tuplas(self.itens, self.cons_offsets, self.cons_ids),
+                **colunas,
+            }
+        return pd.DataFrame(colunas, copy=False)
+
+    def para_arrow(self):
+        pa = _pyarrow()
+        return pa.table({
+            "antecedente": _lista_arrow(self.itens, self.ant_offsets, self.ant_ids),
+            "consequente": _lista_arrow(self.itens, self.cons_offsets, self.cons_ids),
+            "suporte": self.suporte,
+            "confianca": self.confianca,
+            "lift": self.lift,
+        })
+
+    def salvar_parquet(self, caminho: str):
+        tabela = self.para_arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(tabela, caminho)
+
+    def salvar(self, caminho: str):
+        np.savez(caminho, itens=self.itens.astype(str), ant_offsets=self.ant_offsets, ant_ids=self.ant_ids,
+                 cons_offsets=self.cons_offsets, cons_ids=self.cons_ids,
+                 suporte=self.suporte, confianca=self.confianca, lift=self.lift)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "RegrasColunares":
+        with np.load(caminho) as dados:
+            return cls(dados["itens"], dados["ant_offsets"], dados["ant_ids"], dados["cons_offsets"],
+                       dados["cons_ids"], dados["suporte"], dados["confianca"], dados["lift"])
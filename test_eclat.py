@@ -0,0 +1,73 @@
+import random
+
+from eclat import MineradorECLAT
+
+
+def _transacoes(semente, n_transacoes=6000, n_itens=12):
+    gerador = random.Random(semente)
+    return [[f"item{j}" for j in range(n_itens) if gerador.random() < 0.1 + 0.04 * j] for _ in range(n_transacoes)]
+
+
+def _como_dict(itemsets):
+    return {itemsets.itemset(i): int(itemsets.contagem[i]) for i in range(len(itemsets))}
+
+
+def test_aproximado_verificado_igual_ao_exato():
+    for semente in range(5):
+        transacoes = _transacoes(semente)
+        exato = MineradorECLAT(min_suporte=0.1).minerar_itemsets(transacoes, max_tamanho=3)
+        aproximado = MineradorECLAT(min_suporte=0.1).minerar_itemsets_aproximado(
+            transacoes, epsilon=0.05, delta=0.05, max_tamanho=3, semente=semente)
+
+        assert aproximado.total_transacoes == exato.total_transacoes
+        assert _como_dict(aproximado.itemsets_frequentes) == _como_dict(exato.itemsets_frequentes)
+
+
+def test_sem_perdidos_quando_fronteira_nao_e_frequente():
+    transacoes = [["a", "b"] if i % 10 else ["c"] for i in range(5000)] #suportes 0.9 (a, b, ab) e 0.1 (c): longe do mínimo
+    miner = MineradorECLAT(min_suporte=0.3).minerar_itemsets_aproximado(transacoes, epsilon=0.05, delta=0.05, semente=3)
+
+    assert miner.itemsets_frequentes.total_transacoes == 5000
+    assert _como_dict(miner.itemsets_frequentes) == {("a",): 4500, ("b",): 4500, ("a", "b"): 4500}
+    assert len(miner.itemsets_possivelmente_perdidos) == 0
+
+
+def test_perdido_na_amostra_vai_para_possivelmente_perdidos():
+    transacoes = [["a", "b"]] * 500 + [["a"]] * 250 + [["b"]] * 250 #ab tem suporte 0.5, exatamente o mínimo
+    miner = MineradorECLAT(min_suporte=0.5).minerar_itemsets_aproximado(transacoes, epsilon=0.2, delta=0.9, semente=92)
+
+    #na amostra (n=28) ab fica abaixo do suporte reduzido; a contagem na base completa o recupera
+    assert _como_dict(miner.itemsets_possivelmente_perdidos) == {("a", "b"): 500}
+    assert _como_dict(miner.itemsets_frequentes) == {("a",): 750, ("b",): 750, ("a", "b"): 500}
+
+
+def test_sem_verificacao_cobre_os_frequentes_exatos():
+    for semente in range(5):
+        transacoes = _transacoes(semente)
+        exato = MineradorECLAT(min_suporte=0.1).minerar_itemsets(transacoes, max_tamanho=3)
+        aproximado = MineradorECLAT(min_suporte=0.1).minerar_itemsets_aproximado(
+            transacoes, epsilon=0.05, delta=0.05, max_tamanho=3, verificar=False, semente=semente)
+
+        frequentes = _como_dict(aproximado.itemsets_frequentes)
+        perdidos = _como_dict(aproximado.itemsets_possivelmente_perdidos)
+        assert aproximado.itemsets_frequentes.total_transacoes < aproximado.total_transacoes #contagens da amostra
+        assert not frequentes.keys() & perdidos.keys()
+        assert _como_dict(exato.itemsets_frequentes).keys() <= frequentes.keys() | perdidos.keys()
+
+
+def test_amostra_maior_que_a_base_usa_modo_exato(capsys):
+    transacoes = _transacoes(0, n_transacoes=500)
+    exato = MineradorECLAT(min_suporte=0.1).minerar_itemsets(transacoes, max_tamanho=3)
+    aproximado = MineradorECLAT(min_suporte=0.1).minerar_itemsets_aproximado(
+        transacoes, epsilon=0.05, delta=0.05, max_tamanho=3, verificar=False, semente=0)
+
+    assert "usando modo exato" in capsys.readouterr().out
+    assert aproximado.itemsets_frequentes.total_transacoes == aproximado.total_transacoes == exato.total_transacoes
+    assert _como_dict(aproximado.itemsets_frequentes) == _como_dict(exato.itemsets_frequentes)
+    assert len(aproximado.itemsets_possivelmente_perdidos) == 0
+
+
+def test_fronteira_negativa():
+    itemsets = {(0,), (1,), (0, 1), (2,)}
+
+    assert MineradorECLAT._fronteira_negativa(itemsets, range(5)) == {(0, 2), (1, 2), (3,), (4,)}
@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from eclat import MineradorECLAT
+from resultados import ItemsetsColunares, RegrasColunares
+
+
+def _minerador():
+    transacoes = [["a", "b", "c"]] * 4 + [["a", "b"]] * 2 + [["a", "c"]] + [["b", "c"]] + [["d"]] * 2
+    return MineradorECLAT(min_suporte=0.2, min_confianca=0.4, min_lift=1.0).minerar_itemsets(transacoes).gerar_regras()
+
+
+def _regras():
+    #(a) -> (b, c); (a, b) -> (c); (d) -> (a)
+    return RegrasColunares(["a", "b", "c", "d"], [0, 1, 3, 4], [0, 0, 1, 3], [0, 2, 3, 4], [1, 2, 2, 0],
+                           [0.2, 0.3, 0.1], [0.5, 0.9, 0.4], [1.5, 2.0, 1.5])
+
+
+def _como_lista(regras):
+    return [(regras.antecedente(i), regras.consequente(i), float(regras.suporte[i]), float(regras.confianca[i]),
+             float(regras.lift[i])) for i in range(len(regras))]
+
+
+def test_gerar_regras():
+    miner = _minerador()
+    esperadas = {
+        (("a",), ("b",)): (0.6, 6 / 7, 60 / 49),
+        (("b",), ("a",)): (0.6, 6 / 7, 60 / 49),
+        (("c",), ("a",)): (0.5, 5 / 6, 25 / 21),
+        (("c",), ("b",)): (0.5, 5 / 6, 25 / 21),
+        (("a",), ("c",)): (0.5, 5 / 7, 25 / 21),
+        (("b",), ("c",)): (0.5, 5 / 7, 25 / 21),
+        (("a", "c"), ("b",)): (0.4, 0.8, 8 / 7),
+        (("b", "c"), ("a",)): (0.4, 0.8, 8 / 7),
+        (("a",), ("b", "c")): (0.4, 4 / 7, 8 / 7),
+        (("b",), ("a", "c")): (0.4, 4 / 7, 8 / 7),
+        (("c",), ("a", "b")): (0.4, 2 / 3, 10 / 9),
+        (("a", "b"), ("c",)): (0.4, 2 / 3, 10 / 9),
+    }
+
+    regras = {(ant, cons): metricas for ant, cons, *metricas in _como_lista(miner.regras)}
+    assert regras.keys() == esperadas.keys()
+    for chave, metricas in esperadas.items():
+        assert regras[chave] == pytest.approx(metricas)
+    chaves_ordem = list(zip(-miner.regras.lift, -miner.regras.confianca, -miner.regras.suporte))
+    assert chaves_ordem == sorted(chaves_ordem)
+
+
+def test_recomendar():
+    miner = _minerador()
+
+    carrinho_ab = miner.recomendar(["a", "b"]) #dispara a->c, b->c, ab->c, a->bc e b->ac; a e b já estão no carrinho
+    assert [item for item, _ in carrinho_ab] == ["c"]
+    assert carrinho_ab[0][1] == pytest.approx(2 * (5 / 7) * (25 / 21) + (2 / 3) * (10 / 9) + 2 * (4 / 7) * (8 / 7))
+
+    carrinho_a = miner.recomendar(["a"]) #ac->b, bc->a e ab->c não disparam; a->bc soma para b e para c
+    assert [item for item, _ in carrinho_a] == ["b", "c"]
+    assert carrinho_a[0][1] == pytest.approx((6 / 7) * (60 / 49) + (4 / 7) * (8 / 7))
+    assert carrinho_a[1][1] == pytest.approx((5 / 7) * (25 / 21) + (4 / 7) * (8 / 7))
+
+    assert miner.recomendar(["d"]) == []
+    assert miner.recomendar(["a", "b"], top_n=0) == []
+
+
+def test_selecionar_e_ordenadas():
+    regras = _regras()
+
+    selecionadas = regras.selecionar([2, 0])
+    assert _como_lista(selecionadas) == [(("d",), ("a",), 0.1, 0.4, 1.5), (("a",), ("b", "c"), 0.2, 0.5, 1.5)]
+    assert selecionadas.ant_offsets.tolist() == [0, 1, 2]
+    assert selecionadas.cons_offsets.tolist() == [0, 1, 3]
+
+    assert _como_lista(regras.ordenadas()) == [
+        (("a", "b"), ("c",), 0.3, 0.9, 2.0),
+        (("a",), ("b", "c"), 0.2, 0.5, 1.5),
+        (("d",), ("a",), 0.1, 0.4, 1.5),
+    ]
+
+    itemsets = ItemsetsColunares(["a", "b", "c"], [0, 1, 3, 6], [0, 0, 1, 0, 1, 2], [7, 6, 4], 10)
+    selecionados = itemsets.selecionar([2, 0])
+    assert [selecionados.itemset(i) for i in range(len(selecionados))] == [("a", "b", "c"), ("a",)]
+    assert selecionados.contagem.tolist() == [4, 7]
+    assert selecionados.suporte.tolist() == [0.4, 0.7]
+
+
+def test_salvar_e_carregar(tmp_path):
+    miner = _minerador()
+
+    miner.itemsets_frequentes.salvar(tmp_path / "itemsets.npz")
+    itemsets = ItemsetsColunares.carregar(tmp_path / "itemsets.npz")
+    assert itemsets.itens.tolist() == miner.itemsets_frequentes.itens.tolist()
+    for coluna in ("offsets", "item_ids", "contagem"):
+        np.testing.assert_array_equal(getattr(itemsets, coluna), getattr(miner.itemsets_frequentes, coluna))
+    assert itemsets.total_transacoes == miner.itemsets_frequentes.total_transacoes
+
+    miner.regras.salvar(tmp_path / "regras.npz")
+    regras = RegrasColunares.carregar(tmp_path / "regras.npz")
+    assert regras.itens.tolist() == miner.regras.itens.tolist()
+    for coluna in ("ant_offsets", "ant_ids", "cons_offsets", "cons_ids", "suporte", "confianca", "lift"):
+        np.testing.assert_array_equal(getattr(regras, coluna), getattr(miner.regras, coluna))
+
+
+def test_vazio():
+    itemsets = ItemsetsColunares.vazio().para_dataframe(rotulos=True)
+    assert list(itemsets.columns) == ["itemset", "count", "support"]
+    assert len(itemsets) == 0
+
+    regras = RegrasColunares.vazio().para_dataframe(rotulos=True)
+    assert list(regras.columns) == ["antecedente", "consequente", "suporte", "confianca", "lift"]
+    assert len(regras) == 0
+
+    nenhuma = _regras().selecionar([])
+    assert len(nenhuma) == 0
+    assert nenhuma.ant_offsets.tolist() == [0] and nenhuma.cons_offsets.tolist() == [0]
+    assert len(nenhuma.para_dataframe(rotulos=True)) == 0
+
+    miner = MineradorECLAT(min_suporte=0.5).minerar_itemsets([["a"], ["b"], ["c"]]).gerar_regras()
+    assert len(miner.regras) == 0
+    assert miner.regras_df().empty
+    assert miner.recomendar(["a"]) == []
+
+
+def test_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    miner = _minerador()
+    itemsets, regras = miner.itemsets_frequentes, miner.regras
+
+    itemsets.salvar_parquet(tmp_path / "itemsets.parquet")
+    tabela = pq.read_table(tmp_path / "itemsets.parquet").to_pydict()
+    assert [tuple(itemset) for itemset in tabela["itemset"]] == [itemsets.itemset(i) for i in range(len(itemsets))]
+    assert tabela["count"] == itemsets.contagem.tolist()
+    assert tabela["support"] == itemsets.suporte.tolist()
+
+    regras.salvar_parquet(tmp_path / "regras.parquet")
+    tabela = pq.read_table(tmp_path / "regras.parquet").to_pydict()
+    assert [tuple(ant) for ant in tabela["antecedente"]] == [regras.antecedente(i) for i in range(len(regras))]
+    assert [tuple(cons) for cons in tabela["consequente"]] == [regras.consequente(i) for i in range(len(regras))]
+    for coluna in ("suporte", "confianca", "lift"):
+        assert tabela[coluna] == getattr(regras, coluna).tolist()